@@ -1,12 +1,13 @@
 from flask import Flask, jsonify, request, send_from_directory
 from flask_cors import CORS
 from flasgger import Swagger
-from db import get_conn, init_db, ensure_schema
+from db import get_conn, init_db, ensure_schema, run_maintenance
 import sqlite3
 from werkzeug.exceptions import HTTPException
 from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
 import os
+import click
 
 
 app = Flask(__name__)
@@ -207,6 +208,7 @@ responses:
                   d.created_at AS dono_created_at
            FROM cachorros c
            JOIN donos d ON d.id = c.dono_id
+           WHERE c.deleted_at IS NULL
            ORDER BY c.id DESC
         """).fetchall()
     data = [dict(r) for r in rows]
@@ -252,7 +254,7 @@ responses:
                   d.created_at AS dono_created_at
            FROM cachorros c
            JOIN donos d ON d.id = c.dono_id
-           WHERE c.id = ?
+           WHERE c.id = ? AND c.deleted_at IS NULL
         """, (cachorro_id,)).fetchone()
         if not row:
             return {"erro": "não encontrado"}, 404
@@ -278,7 +280,7 @@ Deletar cachorro por ID
 ---
 tags:
   - Cachorros
-summary: Remove um cachorro pelo ID
+summary: Remove um cachorro pelo ID (soft-delete; arquivado pela manutenção)
 parameters:
   - in: path
     name: cachorro_id
@@ -293,7 +295,9 @@ responses:
 
 
     with get_conn() as conn:
-        cur = conn.execute("DELETE FROM cachorros WHERE id=?", (cachorro_id,))
+        cur = conn.execute(
+            "UPDATE cachorros SET deleted_at=datetime('now') WHERE id=? AND deleted_at IS NULL",
+            (cachorro_id,))
         conn.commit()
         if cur.rowcount == 0:
             return {"erro": "não encontrado"}, 404
@@ -327,7 +331,7 @@ def listar_donos():
             SELECT d.id, d.nome_completo, d.bloco, d.apartamento,
                    COUNT(c.id) AS quantidade_cachorros
             FROM donos d
-            LEFT JOIN cachorros c ON c.dono_id = d.id
+            LEFT JOIN cachorros c ON c.dono_id = d.id AND c.deleted_at IS NULL
             GROUP BY d.id, d.nome_completo, d.bloco, d.apartamento
             ORDER BY d.nome_completo COLLATE NOCASE
         """).fetchall()
@@ -392,7 +396,7 @@ responses:
         dogs = conn.execute("""
             SELECT id, nome_cachorro, raca, idade, created_at, foto_url
               FROM cachorros
-             WHERE dono_id = ?
+             WHERE dono_id = ? AND deleted_at IS NULL
              ORDER BY id DESC
         """, (dono_id,)).fetchall()
 
@@ -481,7 +485,7 @@ responses:
 
     with get_conn() as conn:
         atual = conn.execute(
-            "SELECT * FROM cachorros WHERE id=?", (cachorro_id,)).fetchone()
+            "SELECT * FROM cachorros WHERE id=? AND deleted_at IS NULL", (cachorro_id,)).fetchone()
         if not atual:
             return {"erro": "não encontrado"}, 404
 
@@ -582,7 +586,7 @@ responses:
 
     with get_conn() as conn:
         row = conn.execute(
-            "SELECT id FROM cachorros WHERE id=?", (cachorro_id,)).fetchone()
+            "SELECT id FROM cachorros WHERE id=? AND deleted_at IS NULL", (cachorro_id,)).fetchone()
         if not row:
             return {"erro": "não encontrado"}, 404
 
@@ -607,5 +611,21 @@ responses:
     return {"ok": True, "foto_url": foto_url}, 200
 
 
+@app.cli.command("manutencao")
+@click.option("--dias", default=0, show_default=True, type=click.IntRange(min=0),
+              help="Dias que um cão excluído fica na tabela antes de ser arquivado.")
+def manutencao(dias):
+    """Arquiva excluídos e donos órfãos, roda VACUUM incremental, ANALYZE e optimize."""
+    r = run_maintenance(dias_retencao=dias)
+    click.echo(f"Cães arquivados: {r['cachorros_arquivados']}")
+    click.echo(f"Donos órfãos arquivados: {r['donos_arquivados']}")
+    click.echo(
+        f"Tamanho: {r['bytes_antes']} -> {r['bytes_depois']} bytes "
+        f"({r['bytes_recuperados']} recuperados)")
+    click.echo("Obs.: as tabelas de arquivo ficam no mesmo mvp.db; "
+               "arquivar move os dados, só índices e espaço livre são recuperados.")
+    click.echo(f"Tempo: {r['segundos']} s")
+
+
 if __name__ == "__main__":
     app.run(debug=True)
@@ -1,5 +1,6 @@
 import sqlite3
 import os
+import time
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "mvp.db")
 
@@ -30,6 +31,8 @@ def ensure_schema():
             conn.execute("ALTER TABLE cachorros ADD COLUMN created_at TEXT")
         if not has_col("cachorros", "foto_url"):
             conn.execute("ALTER TABLE cachorros ADD COLUMN foto_url TEXT")
+        if not has_col("cachorros", "deleted_at"):
+            conn.execute("ALTER TABLE cachorros ADD COLUMN deleted_at TEXT")
 
         # preencher registros antigos com timestamp atual
         conn.execute(
@@ -38,8 +41,12 @@ def ensure_schema():
             "UPDATE cachorros SET created_at = COALESCE(created_at, datetime('now'))")
 
         # índices (idempotentes)
+        # duplicidade só vale para cães ativos (soft-delete libera o nome)
+        conn.execute("DROP INDEX IF EXISTS uniq_cao_por_dono")
         conn.execute(
-            "CREATE UNIQUE INDEX IF NOT EXISTS uniq_cao_por_dono ON cachorros(dono_id, nome_cachorro, idade)")
+            "CREATE UNIQUE INDEX IF NOT EXISTS uniq_cao_ativo_por_dono ON cachorros(dono_id, nome_cachorro, idade) WHERE deleted_at IS NULL")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cachorros_deleted ON cachorros(deleted_at) WHERE deleted_at IS NOT NULL")
         conn.execute(
             "CREATE INDEX IF NOT EXISTS idx_cachorros_dono ON cachorros(dono_id)")
         conn.execute(
@@ -49,3 +56,70 @@ def ensure_schema():
         conn.execute(
             "CREATE INDEX IF NOT EXISTS idx_donos_lookup ON donos(nome_completo, bloco, apartamento)")
         conn.commit()
+
+
+def _db_bytes(conn):
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    return page_size * page_count
+
+
+def run_maintenance(dias_retencao=0):
+    """Arquiva cães excluídos e donos órfãos, compacta o banco e atualiza estatísticas."""
+    if int(dias_retencao) < 0:
+        raise ValueError("dias_retencao deve ser >= 0")
+    inicio = time.perf_counter()
+    with get_conn() as conn:
+        bytes_antes = _db_bytes(conn)
+
+        # cães com soft-delete mais antigo que a retenção saem da tabela quente
+        corte = conn.execute(
+            "SELECT datetime('now', ?)", (f"-{int(dias_retencao)} days",)).fetchone()[0]
+        cachorros_arquivados = conn.execute("""
+            INSERT INTO cachorros_arquivo(id, nome_cachorro, raca, idade, dono_id,
+                                          created_at, foto_url, deleted_at, arquivado_at)
+            SELECT id, nome_cachorro, raca, idade, dono_id,
+                   created_at, foto_url, deleted_at, datetime('now')
+              FROM cachorros
+             WHERE deleted_at IS NOT NULL AND deleted_at <= ?
+        """, (corte,)).rowcount
+        conn.execute(
+            "DELETE FROM cachorros WHERE deleted_at IS NOT NULL AND deleted_at <= ?", (corte,))
+
+        # donos sem nenhum cão (nem mesmo excluído dentro da retenção)
+        donos_arquivados = conn.execute("""
+            INSERT INTO donos_arquivo(id, nome_completo, bloco, apartamento,
+                                      created_at, arquivado_at)
+            SELECT id, nome_completo, bloco, apartamento, created_at, datetime('now')
+              FROM donos d
+             WHERE NOT EXISTS (SELECT 1 FROM cachorros c WHERE c.dono_id = d.id)
+        """).rowcount
+        conn.execute("""
+            DELETE FROM donos
+             WHERE NOT EXISTS (SELECT 1 FROM cachorros c WHERE c.dono_id = donos.id)
+        """)
+        conn.commit()
+
+        # VACUUM não roda dentro de transação; bancos criados antes do
+        # auto_vacuum precisam de um VACUUM completo (uma vez) para convertê-lo
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:  # 2 = INCREMENTAL
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+        else:
+            # executescript percorre o pragma até o fim (execute libera só 1 página)
+            conn.executescript("PRAGMA incremental_vacuum;")
+
+        conn.execute("ANALYZE")
+        conn.execute("PRAGMA optimize")
+        conn.commit()
+
+        bytes_depois = _db_bytes(conn)
+
+    return {
+        "cachorros_arquivados": cachorros_arquivados,
+        "donos_arquivados": donos_arquivados,
+        "bytes_antes": bytes_antes,
+        "bytes_depois": bytes_depois,
+        "bytes_recuperados": bytes_antes - bytes_depois,
+        "segundos": round(time.perf_counter() - inicio, 3),
+    }
@@ -1,4 +1,6 @@
 PRAGMA foreign_keys = ON;
+-- só tem efeito em banco novo; bancos antigos são convertidos pela manutenção
+PRAGMA auto_vacuum = INCREMENTAL;
 
 CREATE TABLE IF NOT EXISTS donos (
   id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -16,10 +18,30 @@ CREATE TABLE IF NOT EXISTS cachorros (
   FOREIGN KEY (dono_id) REFERENCES donos(id) ON DELETE CASCADE
 );
 
+-- arquivo: registros removidos das tabelas "quentes" pela manutenção
+CREATE TABLE IF NOT EXISTS donos_arquivo (
+  id INTEGER PRIMARY KEY,
+  nome_completo TEXT NOT NULL,
+  bloco TEXT NOT NULL,
+  apartamento TEXT NOT NULL,
+  created_at TEXT,
+  arquivado_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS cachorros_arquivo (
+  id INTEGER PRIMARY KEY,
+  nome_cachorro TEXT NOT NULL,
+  raca TEXT NOT NULL,
+  idade INTEGER NOT NULL,
+  dono_id INTEGER NOT NULL,
+  created_at TEXT,
+  foto_url TEXT,
+  deleted_at TEXT,
+  arquivado_at TEXT NOT NULL
+);
 
--- evitar duplicatas de cão por dono (mesmo nome+idade)
-CREATE UNIQUE INDEX IF NOT EXISTS uniq_cao_por_dono
-  ON cachorros(dono_id, nome_cachorro, idade);
+-- evitar duplicatas de cão por dono (mesmo nome+idade): índice parcial
+-- criado em ensure_schema(), pois depende da coluna deleted_at
 
 -- (já ajuda performance também)
 CREATE INDEX IF NOT EXISTS idx_cachorros_dono ON cachorros(dono_id);
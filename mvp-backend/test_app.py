@@ -0,0 +1,130 @@
+import os
+import sqlite3
+import tempfile
+
+import pytest
+
+import db
+
+# o app inicializa o banco ao ser importado: aponta para um arquivo temporário
+db.DB_PATH = os.path.join(tempfile.mkdtemp(), "mvp.db")
+from app import app  # noqa: E402
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "mvp.db"))
+    db.init_db()
+    db.ensure_schema()
+    return app.test_client()
+
+
+def _criar(client, nome, dono="Ana Souza", apartamento="203", idade=3):
+    r = client.post("/cachorros", json={
+        "nome_cachorro": nome, "raca": "Vira-lata", "idade": idade,
+        "dono": {"nome_completo": dono, "bloco": "B", "apartamento": apartamento},
+    })
+    assert r.status_code == 201
+    return r.get_json()["id"]
+
+
+def _dono_id(client, nome):
+    return next(d["id"] for d in client.get("/donos").get_json()
+                if d["nome_completo"] == nome)
+
+
+def test_soft_delete_esconde_cachorro(client):
+    rex = _criar(client, "Rex")
+    _criar(client, "Thor")
+    dono_id = _dono_id(client, "Ana Souza")
+
+    assert client.delete(f"/cachorros/{rex}").status_code == 204
+    assert client.delete(f"/cachorros/{rex}").status_code == 404
+    assert client.get(f"/cachorros/{rex}").status_code == 404
+    assert client.put(f"/cachorros/{rex}", json={"idade": 5}).status_code == 404
+    assert [c["nome_cachorro"] for c in client.get("/cachorros").get_json()] == ["Thor"]
+
+    dono = client.get(f"/donos/{dono_id}").get_json()
+    assert [c["nome_cachorro"] for c in dono["cachorros"]] == ["Thor"]
+    assert client.get("/donos").get_json()[0]["quantidade_cachorros"] == 1
+
+    # a linha continua na tabela, apenas marcada
+    with db.get_conn() as conn:
+        row = conn.execute(
+            "SELECT deleted_at FROM cachorros WHERE id=?", (rex,)).fetchone()
+    assert row["deleted_at"] is not None
+
+
+def test_nome_reutilizavel_apos_delete(client):
+    rex = _criar(client, "Rex")
+    client.delete(f"/cachorros/{rex}")
+    _criar(client, "Rex")
+    r = client.post("/cachorros", json={
+        "nome_cachorro": "Rex", "raca": "Vira-lata", "idade": 3,
+        "dono": {"nome_completo": "Ana Souza", "bloco": "B", "apartamento": "203"},
+    })
+    assert r.status_code == 409
+
+
+def test_manutencao_arquiva_cachorros_e_donos_orfaos(client):
+    rex = _criar(client, "Rex")
+    _criar(client, "Thor")
+    bob = _criar(client, "Bob", dono="Carlos Lima", apartamento="101")
+    client.delete(f"/cachorros/{rex}")
+    client.delete(f"/cachorros/{bob}")
+
+    # dentro da retenção nada sai da tabela
+    r = db.run_maintenance(dias_retencao=30)
+    assert r["cachorros_arquivados"] == 0
+    assert r["donos_arquivados"] == 0
+
+    r = db.run_maintenance()
+    assert r["cachorros_arquivados"] == 2
+    assert r["donos_arquivados"] == 1
+    assert r["bytes_recuperados"] == r["bytes_antes"] - r["bytes_depois"]
+
+    assert [d["nome_completo"] for d in client.get("/donos").get_json()] == ["Ana Souza"]
+    with db.get_conn() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM cachorros").fetchone()[0] == 1
+        arquivados = {r["id"] for r in conn.execute("SELECT id FROM cachorros_arquivo")}
+        donos = [r["nome_completo"] for r in conn.execute("SELECT * FROM donos_arquivo")]
+    assert arquivados == {rex, bob}
+    assert donos == ["Carlos Lima"]
+
+
+def test_manutencao_converte_banco_antigo_para_vacuum_incremental(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "antigo.db"))
+    conn = sqlite3.connect(db.DB_PATH)
+    conn.executescript("""
+        CREATE TABLE donos (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            nome_completo TEXT NOT NULL, bloco TEXT NOT NULL,
+                            apartamento TEXT NOT NULL);
+        CREATE TABLE cachorros (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                                nome_cachorro TEXT NOT NULL, raca TEXT NOT NULL,
+                                idade INTEGER NOT NULL, dono_id INTEGER NOT NULL);
+    """)
+    conn.close()
+    db.init_db()
+    db.ensure_schema()
+
+    with db.get_conn() as conn:
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 0
+        for i in range(200):
+            conn.execute(
+                "INSERT INTO donos(nome_completo, bloco, apartamento) VALUES (?,?,?)",
+                ("x" * 500, "A", str(i)))
+        conn.commit()
+
+    db.run_maintenance()
+    with db.get_conn() as conn:
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        assert conn.execute("SELECT COUNT(*) FROM donos").fetchone()[0] == 0
+
+    db.run_maintenance()
+    with db.get_conn() as conn:
+        assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+
+
+def test_manutencao_rejeita_retencao_negativa(client):
+    with pytest.raises(ValueError):
+        db.run_maintenance(dias_retencao=-5)